@@ -9,13 +9,15 @@ and how much time could be taken off by making additional payments.
 from __future__ import annotations
 
 import argparse
+import functools
 import re
 import sys
-from collections import defaultdict
-from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
-from decimal import ROUND_UP, Decimal
+from decimal import Decimal
+
+# Payments are given as "X:####.##", where X is a count or period of months
+PAYMENT_PATTERN = re.compile(r"(\d+):(\d+(?:\.\d{2})?)")
 
 
 @dataclass
@@ -27,7 +29,7 @@ class ExtraPayment:
 
     @classmethod
     def parse(cls, value: str) -> ExtraPayment:
-        if not (match := re.match(r"(\d+):(\d+(?:\.\d{2})?)", value)):
+        if not (match := PAYMENT_PATTERN.fullmatch(value)):
             raise ValueError(f"Payment needs to be in form X:####.##: {value}")
         return ExtraPayment(count=int(match.group(1)), amount=Decimal(match.group(2)))
 
@@ -41,7 +43,7 @@ class PeriodicPayment:
 
     @classmethod
     def parse(cls, value: str) -> PeriodicPayment:
-        if not (match := re.match(r"(\d+):(\d+(?:\.\d{2})?)", value)):
+        if not (match := PAYMENT_PATTERN.fullmatch(value)):
             raise ValueError(f"Payment needs to be in form X:####.##: {value}")
         return PeriodicPayment(
             period=int(match.group(1)), payment=Decimal(match.group(2))
@@ -141,71 +143,127 @@ def calculate(
             )
         )
 
-    totals = defaultdict(int)
-    months = iter_months(starting)
+    first_month = month_counter(starting)
+
+    count, total_paid, total_interest, schedule = simulate(
+        to_cents(balance),
+        to_cents(payment),
+        rate,
+        extra_payments=[(p.count, to_cents(p.amount)) for p in extra_payments],
+        periodic_payments=[(p.period, to_cents(p.payment)) for p in periodic_payments],
+    )
+
+    if verbose:
+        # format as floats (exact enough for cents) and write the rows all at once
+        rows = []
+        for offset, row in enumerate(schedule):
+            principal_payment, interest_payment, balance_cents, principal = row
+            rows.append(
+                f"{month_label(first_month + offset)}  "
+                f"{principal_payment / 100:10.2f}  {interest_payment / 100:10.2f}  "
+                f"{balance_cents / 100:10.2f}  {principal / 100:10.2f}\n"
+            )
+        sys.stdout.write("".join(rows))
+
+    print(f"Total # of Payments: {count} ({count / 12:.2f} years)")
+    if count:
+        # with no payments there is no payoff month (the last payment's month)
+        print(f"Payoff month: {month_label(first_month + count - 1)}")
+    print(f"Total Amount Paid: ${to_dollars(total_paid):,.2f}")
+    print(f"Total Interest Paid: ${to_dollars(total_interest):,.2f}")
+
+
+def simulate(
+    balance_cents: int,
+    payment_cents: int,
+    rate: Decimal,
+    *,
+    extra_payments: list[tuple[int, int]],
+    periodic_payments: list[tuple[int, int]],
+) -> tuple[int, int, int, list[tuple[int, int, int, int]]]:
+    """Step through the loan one payment at a time.
+
+    Amounts are in integer cents so the loop doesn't allocate a Decimal per operation.
+    `extra_payments` are `(count, cents)` pairs and
+    `periodic_payments` are `(period, cents)` pairs.
+    Returns the number of payments, total paid, total interest,
+    and a `(principal, interest, balance, total principal)` row for each month.
+
+    """
+    rate_numerator, rate_denominator = rate.as_integer_ratio()
+    interest_denominator = 12 * rate_denominator
+
+    # running total of the extra payments, dropping each one once its months are up
+    # (sorted longest first so the next to expire is at the end of the list)
+    expiring = sorted(extra_payments, reverse=True)
+    active_extra = sum(extra_payment for _, extra_payment in extra_payments)
+
+    total_interest = 0
+    total_paid = 0
+    schedule = []
     count = 0
-    while balance > 0:
-        month = next(months)
+    while balance_cents > 0:
         count += 1
-        # the rounding method might vary by lender
-        interest_payment = (balance * rate / 12).quantize(Decimal("1.00"), ROUND_UP)
-        totals["interest"] += interest_payment
-        principal_payment = payment - interest_payment
+        # the rounding method might vary by lender (this rounds up to the next cent)
+        interest_payment = -(-balance_cents * rate_numerator // interest_denominator)
+        total_interest += interest_payment
+        principal_payment = payment_cents - interest_payment
 
         # add up the extra principal for this month
-        principal_extra = 0
-
-        for idx in range(len(extra_payments)):
-            # using index since I will be modifying the list as the payments complete
-            extra_payment = extra_payments[idx]
-            if extra_payment.count < 1:
-                # this should have already been caught
-                del extra_payments[idx]
-                continue
-            principal_extra += extra_payment.amount
-            extra_payment.count -= 1
-            if extra_payment.count == 0:
-                del extra_payments[idx]
+        while expiring and expiring[-1][0] < count:
+            active_extra -= expiring.pop()[1]
+        principal_extra = active_extra
 
-        for periodic_payment in periodic_payments:
-            if count % periodic_payment.period != 0:
+        for period, periodic_payment in periodic_payments:
+            if count % period != 0:
                 continue
-            principal_extra += periodic_payment.payment
+            principal_extra += periodic_payment
 
-        if principal_payment > balance:
-            principal_payment = balance
+        if principal_payment > balance_cents:
+            principal_payment = balance_cents
             principal_extra = 0
-        elif principal_payment + principal_extra > balance:
-            principal_extra = balance - principal_payment
+        elif principal_payment + principal_extra > balance_cents:
+            principal_extra = balance_cents - principal_payment
 
-        totals["payments"] += interest_payment + principal_payment + principal_extra
+        total_paid += interest_payment + principal_payment + principal_extra
 
-        balance -= principal_payment + principal_extra
+        balance_cents -= principal_payment + principal_extra
 
-        if verbose:
-            print(
-                f"{month:%b %Y}  {principal_payment:10.2f}  {
-                    interest_payment:10.2f}  "
-                f"{balance:10.2f}  {principal_payment + principal_extra:10.2f}"
+        schedule.append(
+            (
+                principal_payment,
+                interest_payment,
+                balance_cents,
+                principal_payment + principal_extra,
             )
+        )
 
-    print(f"Total # of Payments: {count} ({count / 12:.2f} years)")
-    print(f"Payoff month: {month:%b %Y}")
-    print(f"Total Amount Paid: ${totals['payments']:,.2f}")
-    print(f"Total Interest Paid: ${totals['interest']:,.2f}")
+    return count, total_paid, total_interest, schedule
+
+
+def to_cents(value: Decimal) -> int:
+    """Convert a dollar amount to whole cents."""
+    return int(value.scaleb(2).quantize(Decimal(1)))
+
+
+def to_dollars(cents: int) -> Decimal:
+    """Convert whole cents back to a dollar amount."""
+    return Decimal(cents).scaleb(-2)
 
 
-def iter_months(start: date = None) -> Iterator[date]:
+def month_counter(start: date | None = None) -> int:
+    """Return the number of months since year 0, so months can be offset by adding."""
     # Based on https://stackoverflow.com/a/5734564
     if not start:
         start = date.today()
+    return start.year * 12 + start.month - 1
 
-    month_counter = start.year * 12 + start.month - 1
 
-    while True:
-        year, month = divmod(month_counter, 12)
-        yield date(year, month + 1, 1)
-        month_counter += 1
+@functools.lru_cache(maxsize=512)
+def month_label(counter: int) -> str:
+    """Return the "Mon YYYY" label for a `month_counter` value."""
+    year, month = divmod(counter, 12)
+    return f"{date(year, month + 1, 1):%b %Y}"
 
 
 def parse_month(value: str) -> date:
@@ -10,11 +10,14 @@ Requires `requests`, but I think that's commonly found in the "system" Python pa
 """
 
 import json
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import requests
+from requests.adapters import HTTPAdapter
 
 DATA_FILE = "pnt_data.json"
 # Day of week that episodes are dated
@@ -22,6 +25,12 @@ EPISODE_DAY = 5  # Monday = 0, Sunday = 6
 URL_PATTERN = (
     "https://insightforliving.swncdn.com/mp3/podcasts/PNT/PNT{:%Y.%m.%d}-PODCAST.mp3"
 )
+# Number of episodes to download at once
+MAX_WORKERS = 8
+# Bytes to read at a time when writing episodes to disk
+CHUNK_SIZE = 64 * 1024
+# Statuses from servers that reject HEAD (Method Not Allowed, Not Implemented)
+HEAD_UNSUPPORTED = {405, 501}
 
 
 def main():
@@ -55,30 +64,83 @@ def main():
 
     print(f"Starting from {starting_date}")
     processing = starting_date
+    episodes = []
 
     today = date.today()
     # the whole month is available at once, so load through end of month, not today
     while (processing.year, processing.month) <= (today.year, today.month):
-        url = URL_PATTERN.format(processing)
-        print(f"Getting {url}...")
-        r = requests.get(url)
-
-        if not r.ok:
-            print(f"Failed to download episode for {processing}, quiting.")
-            break
-
-        audio_file = output_path / f"PNT{processing:%Y.%m.%d}-PODCAST.mp3"
-        print(f"Writing to {audio_file}")
-        with open(audio_file, "wb") as f:
-            f.write(r.content)
-
-        settings["downloaded"] = str(processing)
+        episodes.append(processing)
         processing += timedelta(days=7)
 
+    with requests.Session() as session:
+        # share keep-alive connections to the host between the download threads
+        session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            available = available_episodes(executor, session, episodes)
+            results = executor.map(
+                lambda episode: download_episode(session, episode, output_path),
+                available,
+            )
+
+            # only record episodes up to the first failure so it is retried next time
+            for episode, downloaded in zip(available, results, strict=True):
+                if not downloaded:
+                    print(f"Failed to download episode for {episode}, quiting.")
+                    break
+                settings["downloaded"] = str(episode)
+
     print("Saving settings...")
     with open(output_path / DATA_FILE, "w") as f:
         json.dump(settings, f)
 
 
+def available_episodes(
+    executor: ThreadPoolExecutor, session: requests.Session, episodes: list[date]
+) -> list[date]:
+    """Return the episodes before the first gap, which is retried next time."""
+    available = []
+    found = executor.map(lambda episode: episode_exists(session, episode), episodes)
+    for episode, exists in zip(episodes, found, strict=True):
+        if not exists:
+            print(f"No episode found for {episode}, stopping there.")
+            break
+        available.append(episode)
+    return available
+
+
+def episode_exists(session: requests.Session, episode: date) -> bool:
+    """Check with HEAD so missing episodes don't start a body transfer."""
+    r = session.head(URL_PATTERN.format(episode), allow_redirects=True)
+    # if the server doesn't support HEAD, leave it to the GET status
+    return r.ok or r.status_code in HEAD_UNSUPPORTED
+
+
+def download_episode(
+    session: requests.Session, episode: date, output_path: Path
+) -> bool:
+    """Save the episode to `output_path`, returning whether it succeeded."""
+    audio_file = output_path / f"PNT{episode:%Y.%m.%d}-PODCAST.mp3"
+    # episodes after a failed one still finish, so don't get them again next time
+    if audio_file.exists():
+        print(f"Already have {audio_file}")
+        return True
+
+    url = URL_PATTERN.format(episode)
+    print(f"Getting {url}...")
+    with session.get(url, stream=True) as r:
+        if not r.ok:
+            return False
+
+        print(f"Writing to {audio_file}")
+        # stream to disk rather than holding the whole episode in memory,
+        # and only give it the final name once it is complete
+        partial_file = audio_file.with_name(f"{audio_file.name}.part")
+        r.raw.decode_content = True
+        with open(partial_file, "wb") as f:
+            shutil.copyfileobj(r.raw, f, CHUNK_SIZE)
+        partial_file.replace(audio_file)
+    return True
+
+
 if __name__ == "__main__":
     sys.exit(main())